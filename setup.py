@@ -7,7 +7,10 @@ in order to have Qt resources (UI and images) compiled and
 put in place
 """
 import os
+import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
 
 from pkg_resources import VersionConflict, require
 from setuptools import setup
@@ -20,10 +23,41 @@ except VersionConflict:
 
 
 def compile_qt_resources():
-    """Executes Qt resources compilation script"""
+    """Compiles Qt UI and resource files into Python modules of the generated package"""
 
-    if os.system(f'{os.path.dirname(os.path.abspath(__file__))}/utils/compile_ui_and_rc.sh') != 0:
-        raise RuntimeError("Qt resource compilation failed")
+    # imported here so other setup commands don't require PyQt5
+    from PyQt5.uic import compileUi
+
+    print("******* compiling Qt resources : Start")
+
+    src = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+    generated = os.path.join(src, "generated")
+
+    try:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+
+            rc_futures = []
+            for rc in glob(os.path.join(src, "resources", "*.qrc")):
+                py = os.path.join(generated, os.path.basename(rc).replace(".qrc", "_rc.py"))
+                print(f"Compiling : {rc}")
+                rc_futures.append(executor.submit(subprocess.run, ["pyrcc5", rc, "-o", py], check=True))
+
+            # UI files are compiled in-process while pyrcc5 runs
+            for ui in glob(os.path.join(src, "als", "ui", "*.ui")):
+                py = os.path.join(generated, os.path.basename(ui).replace(".ui", ".py"))
+                print(f"Compiling : {ui}")
+                with open(ui) as ui_file, open(py, "w") as py_file:
+                    compileUi(ui_file, py_file, from_imports=True, import_from="generated")
+
+            for future in rc_futures:
+                future.result()
+
+    # pyuic reports malformed UI files through XML parsing and its own exception types
+    # pylint: disable=W0703
+    except Exception as error:
+        raise RuntimeError(f"Qt resource compilation failed : {error}") from error
+
+    print("******* compiling Qt resources : Done")
 
 
 if __name__ == "__main__":
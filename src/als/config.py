@@ -16,16 +16,20 @@
 """
 Provides application defaults and high level access to user settings
 """
+import io
 import logging
 import os
+import pickle
 import sys
 from configparser import ConfigParser, DuplicateOptionError, ParsingError
 
 # config file path. We use the pseudo-standard hidden file in user's home
-from als.ui import dialogs
-
 _CONFIG_FILE_PATH = os.path.expanduser("~/.als.cfg")
 
+# cache file path. It stores config entries along with config file mtime and size, so we can skip config
+# file parsing at startup when it has not changed since last run
+_CACHE_FILE_PATH = _CONFIG_FILE_PATH + ".cache"
+
 # keys used to retrieve config values
 _SCAN_FOLDER_PATH = "scan_folder_path"
 _WORK_FOLDER_PATH = "work_folder_path"
@@ -40,15 +44,6 @@ _LOG_LEVEL_WARNING = "WARNING"
 _LOG_LEVEL_ERROR = "ERROR"
 _LOG_LEVEL_CRITICAL = "CRITICAL"
 
-# store of matches between human readable log levels and logging module constants
-_LOG_LEVELS = {
-    _LOG_LEVEL_DEBUG:       logging.DEBUG,
-    _LOG_LEVEL_INFO:        logging.INFO,
-    _LOG_LEVEL_WARNING:     logging.WARNING,
-    _LOG_LEVEL_ERROR:       logging.ERROR,
-    _LOG_LEVEL_CRITICAL:    logging.CRITICAL,
-}
-
 # application default values
 _DEFAULTS = {
     _SCAN_FOLDER_PATH:    os.path.expanduser("~/als/scan"),
@@ -61,6 +56,18 @@ _MAIN_SECTION_NAME = "main"
 
 _CONFIG_PARSER = ConfigParser()
 
+# set to True whenever a config entry is actually modified, so we only write to disk when needed
+_DIRTY = False
+
+# parsed config values, served to getters instead of querying the config parser on every read
+_CACHE = dict()
+
+# config values parsed as integers, computed on first read
+_CACHE_INT = dict()
+
+# main window geometry, parsed once from its config entry
+_WINDOW_GEOMETRY_TUPLE = None
+
 
 def is_debug_log_on():
     """
@@ -68,7 +75,7 @@ def is_debug_log_on():
 
     :return: True if loglevel is DEBUG, False otherwise
     """
-    return _get(_LOG_LEVEL) == 'DEBUG'
+    return _get_log_level() == logging.DEBUG
 
 
 def set_debug_log(debug_active):
@@ -91,10 +98,13 @@ def get_www_server_port_number():
     :return: The configured port number, or its default value if config entry
              is not parsable as an int.
     """
-    try:
-        return int(_get(_WWW_SERVER_PORT))
-    except ValueError:
-        return _DEFAULTS[_WWW_SERVER_PORT]
+    if _WWW_SERVER_PORT not in _CACHE_INT:
+        try:
+            _CACHE_INT[_WWW_SERVER_PORT] = int(_get(_WWW_SERVER_PORT))
+        except ValueError:
+            _CACHE_INT[_WWW_SERVER_PORT] = int(_DEFAULTS[_WWW_SERVER_PORT])
+
+    return _CACHE_INT[_WWW_SERVER_PORT]
 
 
 def set_www_server_port_number(port_number):
@@ -104,7 +114,7 @@ def set_www_server_port_number(port_number):
     :param port_number: the port number
     :type port_number: int
     """
-    _set(_WWW_SERVER_PORT, port_number)
+    _set(_WWW_SERVER_PORT, str(port_number))
 
 
 def get_work_folder_path():
@@ -158,7 +168,12 @@ def get_window_geometry():
     - width of the window
     - height of the window
     """
-    return tuple([int(value) for value in _get(_WINDOW_GEOMETRY).split(",")])
+    global _WINDOW_GEOMETRY_TUPLE
+
+    if _WINDOW_GEOMETRY_TUPLE is None:
+        _WINDOW_GEOMETRY_TUPLE = tuple([int(value) for value in _get(_WINDOW_GEOMETRY).split(",")])
+
+    return _WINDOW_GEOMETRY_TUPLE
 
 
 def set_window_geometry(geometry_tuple):
@@ -175,6 +190,9 @@ def set_window_geometry(geometry_tuple):
     - width of the window
     - height of the window
     """
+    global _WINDOW_GEOMETRY_TUPLE
+
+    _WINDOW_GEOMETRY_TUPLE = None
     _set(_WINDOW_GEOMETRY, ",".join([str(value) for value in geometry_tuple]))
 
 
@@ -182,17 +200,92 @@ def save():
     """
     Saves settings to disk.
 
+    Nothing is written if no config entry has been modified since last save. Config is serialized in memory
+    and written to a temporary file next to the real config file, which then atomically replaces it.
+
     :except os_error: Saving could not be done
     """
+    global _DIRTY
+
+    if not _DIRTY:
+        _LOGGER.debug("User configuration unchanged. Skipping save")
+        return
+
+    config_buffer = io.StringIO()
+    _CONFIG_PARSER.write(config_buffer)
+
+    # config file may be a symlink (i.e. into a dotfiles folder) : we replace its target, not the link itself
+    real_config_file_path = os.path.realpath(_CONFIG_FILE_PATH)
+    temp_config_file_path = real_config_file_path + ".tmp"
+
     try:
-        with open(_CONFIG_FILE_PATH, "w") as config_file:
-            _CONFIG_PARSER.write(config_file)
+        _write_file_atomically(real_config_file_path, temp_config_file_path, config_buffer.getvalue().encode("utf-8"))
+        _DIRTY = False
         _LOGGER.info("User configuration saved")
+        _write_cache()
     except OSError as os_error:
         _LOGGER.error("Could not save settings. Error : %s", os_error)
+        # imported here so reading config does not pull in Qt, and to avoid a circular import with dialogs
+        from als.ui import dialogs
         dialogs.error_box("Settings not saved", f"Your settings could not be saved\n\nDetails : {os_error}")
 
 
+def _write_file_atomically(path, temp_path, data):
+    """
+    Writes data to a temporary file readable by owner only, flushes it to disk, then moves it to its final path.
+
+    Temporary file is removed if anything goes wrong.
+
+    :param path: final file path
+    :type path: str
+    :param temp_path: temporary file path. Must be on the same filesystem as path
+    :type temp_path: str
+    :param data: the data to write
+    :type data: bytes
+
+    :except os_error: Writing could not be done
+    """
+    # O_BINARY only exists on Windows, where it prevents newline translation of written bytes
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    try:
+        file_descriptor = os.open(temp_path, flags, 0o600)
+        try:
+            # mode passed to os.open is ignored if temp file was left behind by a previous run.
+            # os.fchmod is not available on Windows before Python 3.13
+            if hasattr(os, "fchmod"):
+                os.fchmod(file_descriptor, 0o600)
+            else:
+                os.chmod(temp_path, 0o600)
+            data_view = memoryview(data)
+            while data_view:
+                data_view = data_view[os.write(file_descriptor, data_view):]
+            os.fsync(file_descriptor)
+        finally:
+            os.close(file_descriptor)
+        os.replace(temp_path, path)
+    finally:
+        # temp file is only left behind if something went wrong
+        if os.path.lexists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+
+def _get_log_level():
+    """
+    Retrieves the configured log level as a logging module constant.
+
+    Level names are case insensitive.
+
+    :return: the configured log level, or logging.INFO if config entry is not a known level name
+    :rtype: int
+    """
+    log_level = logging.getLevelName(_get(_LOG_LEVEL).strip().upper())
+
+    return log_level if isinstance(log_level, int) else logging.INFO
+
+
 def _get(key):
     """
     Retrieves the value of a specific config entry.
@@ -202,9 +295,7 @@ def _get(key):
 
     :return: the value of the config entry identified by key, or it's default value if key is not found
     """
-    # we rely on the fallback mechanism to get our predefined defaults
-    # if no user config is found
-    return _CONFIG_PARSER.get(_MAIN_SECTION_NAME, key, fallback=_DEFAULTS[key])
+    return _CACHE[key]
 
 
 def _set(key, value):
@@ -216,23 +307,92 @@ def _set(key, value):
     :param value: config entry value
     :type value: any
     """
+    global _DIRTY
+
     if value != _get(key):
         _CONFIG_PARSER.set(_MAIN_SECTION_NAME, key, value)
+        _CACHE[key] = value
+        _CACHE_INT.pop(key, None)
+        _DIRTY = True
+
+
+def _read_cache():
+    """
+    Retrieves config file sections from cache file, if cache is in sync with config file.
 
+    :return: the cached config file sections, as expected by ConfigParser.read_dict, or None if cache is
+             missing, stale or unreadable
+    :rtype: dict
+    """
+    try:
+        config_file_stat = os.stat(_CONFIG_FILE_PATH)
+        with open(_CACHE_FILE_PATH, "rb") as cache_file:
+            cache = pickle.load(cache_file)
+        if cache["mtime_ns"] == config_file_stat.st_mtime_ns and cache["size"] == config_file_stat.st_size:
+            return cache["sections"]
+    # a corrupted cache must never prevent app from starting : we just fall back to a full config file parse
+    # pylint: disable=W0703
+    except Exception:
+        pass
 
-# ConfigParser.read won't raise an exception if read fails because of missing file
-# so if app starts and no user settings file exists, we simply
-# get an "empty" config
-# if config file is invalid, we raise a ValueError with details
-try:
-    _CONFIG_PARSER.read(_CONFIG_FILE_PATH)
-except DuplicateOptionError as duplicate_error:
-    raise ValueError(duplicate_error)
-except ParsingError as parsing_error:
-    raise ValueError(parsing_error)
+    return None
+
+
+def _write_cache():
+    """
+    Stores all config sections, including defaults, and current config file mtime and size to cache file.
+
+    Cache file is atomically replaced and, as it holds a copy of user settings, only readable by its owner.
+    """
+    defaults = _CONFIG_PARSER.defaults()
+    sections = {_CONFIG_PARSER.default_section: dict(defaults)}
+
+    # section options include inherited defaults : we only keep values actually set in each section
+    for section in _CONFIG_PARSER.sections():
+        section_entries = dict()
+        for option in _CONFIG_PARSER.options(section):
+            value = _CONFIG_PARSER.get(section, option, raw=True)
+            if option not in defaults or value != defaults[option]:
+                section_entries[option] = value
+        sections[section] = section_entries
+
+    try:
+        config_file_stat = os.stat(_CONFIG_FILE_PATH)
+        cache = {
+            "mtime_ns": config_file_stat.st_mtime_ns,
+            "size": config_file_stat.st_size,
+            "sections": sections,
+        }
+        _write_file_atomically(_CACHE_FILE_PATH, _CACHE_FILE_PATH + ".tmp", pickle.dumps(cache))
+    # failing to write cache must never prevent app from starting or settings from being saved
+    # pylint: disable=W0703
+    except Exception as error:
+        _LOGGER.debug("Could not write config cache. Error : %s", error)
+
+
+_CACHED_CONFIG_SECTIONS = _read_cache()
+
+if _CACHED_CONFIG_SECTIONS is not None:
+    # config file did not change since cache was written : no need to read and parse it
+    _CONFIG_PARSER.read_dict(_CACHED_CONFIG_SECTIONS)
+else:
+    # ConfigParser.read won't raise an exception if read fails because of missing file
+    # so if app starts and no user settings file exists, we simply
+    # get an "empty" config
+    # if config file is invalid, we raise a ValueError with details
+    try:
+        _CONFIG_PARSER.read(_CONFIG_FILE_PATH)
+    except DuplicateOptionError as duplicate_error:
+        raise ValueError(duplicate_error)
+    except ParsingError as parsing_error:
+        raise ValueError(parsing_error)
+
+# we rely on the fallback mechanism to get our predefined defaults
+# if no user config is found
+_CACHE = {key: _CONFIG_PARSER.get(_MAIN_SECTION_NAME, key, fallback=_DEFAULTS[key]) for key in _DEFAULTS}
 
 # init logging system
-logging.basicConfig(level=_LOG_LEVELS[_get(_LOG_LEVEL)],
+logging.basicConfig(level=_get_log_level(),
                     format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
                     stream=sys.stdout)
 _LOGGER = logging.getLogger(__name__)
@@ -251,12 +411,18 @@ if not _CONFIG_PARSER.has_section(_MAIN_SECTION_NAME):
     _CONFIG_PARSER.add_section(_MAIN_SECTION_NAME)
 
 # cleanup unused options
-for option in _CONFIG_PARSER.options(_MAIN_SECTION_NAME):
-    if option not in _DEFAULTS.keys():
-        _LOGGER.debug("Removed obsolete config option : '%s'", option)
-        _CONFIG_PARSER.remove_option(_MAIN_SECTION_NAME, option)
-
-_LOGGER.debug("User config file dump - START")
-for option in _CONFIG_PARSER.options(_MAIN_SECTION_NAME):
-    _LOGGER.debug("%s = %s", option, _get(option))
-_LOGGER.debug("User config file dump - END")
+_OBSOLETE_OPTIONS = [option for option in _CONFIG_PARSER.options(_MAIN_SECTION_NAME) if option not in _DEFAULTS]
+
+for obsolete_option in _OBSOLETE_OPTIONS:
+    _LOGGER.debug("Removed obsolete config option : '%s'", obsolete_option)
+    _CONFIG_PARSER.remove_option(_MAIN_SECTION_NAME, obsolete_option)
+    _DIRTY = True
+
+if _CACHED_CONFIG_SECTIONS is None and os.path.isfile(_CONFIG_FILE_PATH):
+    _write_cache()
+
+if _LOGGER.isEnabledFor(logging.DEBUG):
+    _LOGGER.debug("User config dump - START")
+    for key, value in _CACHE.items():
+        _LOGGER.debug("%s = %s", key, value)
+    _LOGGER.debug("User config dump - END")
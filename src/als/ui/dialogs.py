@@ -38,9 +38,11 @@ class PreferencesDialog(QDialog):
         config.set_work_folder_path(self._ui.ln_work_folder_path.text())
 
         web_server_port_number_str = self._ui.ln_web_server_port.text()
+        # isdigit() would accept characters such as "²" that int() rejects
+        web_server_port_number = int(web_server_port_number_str) if web_server_port_number_str.isdecimal() else -1
 
-        if web_server_port_number_str.isdigit() and 1024 <= int(web_server_port_number_str) <= 65535:
-            config.set_www_server_port_number(web_server_port_number_str)
+        if 1024 <= web_server_port_number <= 65535:
+            config.set_www_server_port_number(web_server_port_number)
         else:
             message = "Web server port number must be a number between 1024 and 65535"
             error_box("Wrong value", message)
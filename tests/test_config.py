@@ -0,0 +1,222 @@
+import importlib
+import logging
+import os
+import sys
+
+from pytest import fixture, raises
+
+
+@fixture
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return tmp_path
+
+
+def load_config():
+    # config is read at import time, so each load must be a fresh import done with the patched HOME
+    sys.modules.pop("als.config", None)
+    return importlib.import_module("als.config")
+
+
+def write_config_file(home, content):
+    (home / ".als.cfg").write_text(content)
+
+
+def test_cache_written_after_config_file_parse(home):
+    write_config_file(home, "[main]\nwww_server_port = 9000\n")
+
+    config = load_config()
+
+    assert config._CACHED_CONFIG_SECTIONS is None
+    assert (home / ".als.cfg.cache").is_file()
+    assert 9000 == config.get_www_server_port_number()
+
+
+def test_cache_hit_skips_config_file_parse(home):
+    write_config_file(home, "[main]\nwww_server_port = 9000\n")
+    load_config()
+
+    # same size and mtime : config file must not be read again
+    config_file_stat = os.stat(home / ".als.cfg")
+    write_config_file(home, "[main]\nwww_server_port = 9999\n")
+    os.utime(home / ".als.cfg", ns=(config_file_stat.st_atime_ns, config_file_stat.st_mtime_ns))
+
+    config = load_config()
+
+    assert {"DEFAULT": {}, "main": {"www_server_port": "9000"}} == config._CACHED_CONFIG_SECTIONS
+    assert 9000 == config.get_www_server_port_number()
+
+
+def test_stale_cache_falls_back_to_config_file_parse(home):
+    write_config_file(home, "[main]\nwww_server_port = 9000\n")
+    load_config()
+
+    write_config_file(home, "[main]\nwww_server_port = 10000\n")
+
+    config = load_config()
+
+    assert config._CACHED_CONFIG_SECTIONS is None
+    assert 10000 == config.get_www_server_port_number()
+
+
+def test_corrupted_cache_falls_back_to_config_file_parse(home):
+    write_config_file(home, "[main]\nwww_server_port = 9000\n")
+    (home / ".als.cfg.cache").write_bytes(b"not a pickle")
+
+    config = load_config()
+
+    assert config._CACHED_CONFIG_SECTIONS is None
+    assert 9000 == config.get_www_server_port_number()
+
+
+def test_cache_hit_keeps_untouched_entries_on_save(home):
+    write_config_file(home, "[main]\nwww_server_port = 9000\n")
+    load_config()
+
+    config = load_config()
+    config.set_work_folder_path("/somewhere")
+    config.save()
+
+    config = load_config()
+
+    assert 9000 == config.get_www_server_port_number()
+    assert "/somewhere" == config.get_work_folder_path()
+
+
+def test_cache_hit_keeps_other_sections_and_defaults_on_save(home):
+    write_config_file(home, "[DEFAULT]\nshared = yes\n\n[main]\nwww_server_port = 9000\n\n[other]\nkey = value\n")
+    load_config()
+
+    config = load_config()
+    assert config._CACHED_CONFIG_SECTIONS is not None
+    config.set_work_folder_path("/somewhere")
+    config.save()
+
+    content = (home / ".als.cfg").read_text()
+    assert "[DEFAULT]\nshared = yes\n" in content
+    assert "[other]\nkey = value\n" in content
+    assert "shared" not in content.split("[main]")[1].split("[other]")[0]
+
+
+def test_failed_cache_write_does_not_prevent_import(home, monkeypatch):
+    write_config_file(home, "[main]\nwww_server_port = 9000\n")
+
+    def failing_dumps(_):
+        raise AttributeError("no pickling today")
+
+    monkeypatch.setattr("pickle.dumps", failing_dumps)
+
+    config = load_config()
+
+    assert 9000 == config.get_www_server_port_number()
+    assert not (home / ".als.cfg.cache").exists()
+    assert not (home / ".als.cfg.cache.tmp").exists()
+
+
+def test_save_without_change_does_not_write(home):
+    config = load_config()
+
+    config.set_www_server_port_number(config.get_www_server_port_number())
+    config.save()
+
+    assert not (home / ".als.cfg").exists()
+
+
+def test_save_after_change_writes(home):
+    config = load_config()
+
+    config.set_www_server_port_number(9100)
+    config.save()
+
+    assert "www_server_port = 9100" in (home / ".als.cfg").read_text()
+    assert not config._DIRTY
+
+
+def test_window_geometry_cache_invalidated_on_set(home):
+    config = load_config()
+    assert (50, 100, 1024, 800) == config.get_window_geometry()
+
+    config.set_window_geometry((1, 2, 3, 4))
+
+    assert (1, 2, 3, 4) == config.get_window_geometry()
+
+
+def test_port_number_cache_invalidated_on_set(home):
+    config = load_config()
+    assert 8000 == config.get_www_server_port_number()
+
+    config.set_www_server_port_number(9100)
+
+    assert 9100 == config.get_www_server_port_number()
+    assert "9100" == config._get("www_server_port")
+
+
+def test_save_replaces_symlink_target_and_keeps_link(home):
+    (home / "dotfiles").mkdir()
+    write_config_file(home / "dotfiles", "[main]\nwww_server_port = 9000\n")
+    (home / ".als.cfg").symlink_to(home / "dotfiles" / ".als.cfg")
+    config = load_config()
+
+    config.set_www_server_port_number(9100)
+    config.save()
+
+    assert (home / ".als.cfg").is_symlink()
+    assert "www_server_port = 9100" in (home / "dotfiles" / ".als.cfg").read_text()
+
+
+def test_save_creates_owner_only_files(home):
+    # a stale temp file with wider permissions must not leak its mode to the saved config
+    (home / ".als.cfg.tmp").write_text("")
+    os.chmod(home / ".als.cfg.tmp", 0o644)
+    config = load_config()
+
+    config.set_www_server_port_number(9100)
+    config.save()
+
+    assert 0o600 == os.stat(home / ".als.cfg").st_mode & 0o777
+    assert 0o600 == os.stat(home / ".als.cfg.cache").st_mode & 0o777
+    assert not (home / ".als.cfg.tmp").exists()
+
+
+def test_save_without_fchmod(home, monkeypatch):
+    monkeypatch.delattr(os, "fchmod", raising=False)
+    config = load_config()
+
+    config.set_www_server_port_number(9100)
+    config.save()
+
+    assert 0o600 == os.stat(home / ".als.cfg").st_mode & 0o777
+    assert not (home / ".als.cfg.tmp").exists()
+
+
+def test_failed_write_leaves_no_temp_file(home, monkeypatch):
+    config = load_config()
+
+    def failing_fsync(_):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "fsync", failing_fsync)
+
+    with raises(OSError):
+        config._write_file_atomically(str(home / "file"), str(home / "file.tmp"), b"data")
+
+    assert not (home / "file").exists()
+    assert not (home / "file.tmp").exists()
+
+
+def test_log_level_is_case_insensitive(home):
+    write_config_file(home, "[main]\nlog_level = debug\n")
+
+    config = load_config()
+
+    assert config.is_debug_log_on()
+    assert config._get_log_level() == logging.DEBUG
+
+
+def test_unknown_log_level_falls_back_to_info(home):
+    write_config_file(home, "[main]\nlog_level = basic_format\n")
+
+    config = load_config()
+
+    assert not config.is_debug_log_on()
+    assert config._get_log_level() == logging.INFO